@@ -1,10 +1,11 @@
+import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk, ImageOps
 import numpy as np
 
-from processing import operations
-from utils import helpers
+from processing import operations, autotune
+from utils import helpers, export
 
 class DigitalImageToolkit:
     def __init__(self, root):
@@ -22,6 +23,7 @@ class DigitalImageToolkit:
         # UI State
         self.image_path = tk.StringVar()
         self.source_selection_var = tk.StringVar(value="Original")
+        self.export_preset_var = tk.StringVar(value=export.PRESETS["png_fast"]["label"])
         
         # Canvas and display data
         self.original_photo = None
@@ -33,6 +35,12 @@ class DigitalImageToolkit:
         self.image_on_canvas_original = None
         self.image_on_canvas_enhanced = None
         self.progress_bar = None
+        self.pending_exports = 0
+
+        # Picks the fastest implementation of each operation for this machine
+        self.tuner = autotune.AutoTuner()
+        # Encodes saved images off the Tk thread
+        self.exporter = export.ExportWorker()
 
         self.create_interface()
     
@@ -87,6 +95,10 @@ class DigitalImageToolkit:
         ttk.Entry(file_frame, textvariable=self.image_path, state="readonly").grid(row=0, column=1, sticky=tk.W+tk.E)
         ttk.Button(file_frame, text="Save Enhanced", command=self.save_image).grid(row=0, column=2, padx=(10, 0))
         ttk.Button(file_frame, text="Reset Enhanced", command=self.reset_enhanced_image).grid(row=0, column=3, padx=(5, 0))
+        ttk.Label(file_frame, text="Save Preset:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Combobox(file_frame, textvariable=self.export_preset_var, state="readonly",
+                     values=[preset["label"] for preset in export.PRESETS.values()]).grid(row=1, column=1, sticky=tk.W+tk.E, pady=(5, 0))
+        ttk.Button(file_frame, text="Save All Presets", command=self.save_all_presets).grid(row=1, column=2, columnspan=2, sticky=tk.W+tk.E, padx=(10, 0), pady=(5, 0))
 
         source_frame = ttk.LabelFrame(parent, text="Process From", padding="10")
         source_frame.grid(row=1, column=0, sticky=tk.W+tk.E, pady=(10, 0))
@@ -216,7 +228,8 @@ class DigitalImageToolkit:
 
     def update_progress(self, value):
         """Updates the progress bar and forces the UI to refresh."""
-        if self.progress_bar:
+        # While a save is running the bar belongs to it and stays indeterminate.
+        if self.progress_bar and not self.pending_exports:
             self.progress_bar['value'] = value
             self.root.update_idletasks()
         
@@ -252,17 +265,60 @@ class DigitalImageToolkit:
         except Exception as e:
             messagebox.showerror("Error", f"Could not load image: {e}")
 
+    def _selected_preset(self):
+        label = self.export_preset_var.get()
+        return next(name for name, preset in export.PRESETS.items() if preset["label"] == label)
+
     def save_image(self):
-        if self.enhanced_image is None:
+        if self.enhanced_array is None:
             messagebox.showwarning("Warning", "No enhanced image to save.")
             return
-        file_path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG", "*.png"), ("JPEG", "*.jpg")])
+        preset = self._selected_preset()
+        spec = export.PRESETS[preset]
+        file_path = filedialog.asksaveasfilename(defaultextension=spec["extension"],
+                                                 filetypes=[(spec["label"], " ".join("*" + ext for ext in spec["extensions"]))])
+        if not file_path:
+            return
+        if not export.matches_extension(file_path, preset):
+            messagebox.showerror("Error", f"'{spec['label']}' writes {' or '.join(spec['extensions'])} files; "
+                                          f"choose a matching file name or a different preset.")
+            return
+        self._start_export([(file_path, preset)])
+
+    def save_all_presets(self):
+        """Saves the enhanced image once per preset, as <name>_<preset>.<ext>."""
+        if self.enhanced_array is None:
+            messagebox.showwarning("Warning", "No enhanced image to save.")
+            return
+        file_path = filedialog.asksaveasfilename(title="Base file name")
         if file_path:
-            try:
-                self.enhanced_image.save(file_path)
-                messagebox.showinfo("Success", f"Image saved to:\n{file_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not save image: {e}")
+            base = os.path.splitext(file_path)[0]
+            self._start_export([(f"{base}_{name}{preset['extension']}", name) for name, preset in export.PRESETS.items()])
+
+    def _start_export(self, targets):
+        if not self.pending_exports:
+            self.progress_bar.configure(mode='indeterminate')
+            self.progress_bar.start(10)
+        self.pending_exports += 1
+        future = self.exporter.submit(self.enhanced_array, targets)
+        self.root.after(100, self._finish_export, future)
+
+    def _finish_export(self, future):
+        """Polls the background export from the Tk thread and reports the result."""
+        if not future.done():
+            self.root.after(100, self._finish_export, future)
+            return
+        self.pending_exports -= 1
+        if not self.pending_exports:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode='determinate', value=0)
+        try:
+            results = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save image: {e}")
+            return
+        lines = [f"{result.path}\n    {result.size_bytes / 1024:,.0f} KB in {result.seconds:.2f} s" for result in results]
+        messagebox.showinfo("Success", "Image saved to:\n" + "\n".join(lines))
 
     def reset_enhanced_image(self):
         """Resets the enhanced image panel to the original image."""
@@ -353,6 +409,7 @@ class DigitalImageToolkit:
                 messagebox.showwarning("Warning", "There is no enhanced image to process. Process from 'Original' first.")
                 return
         
+        operation_func = self.tuner.resolve(operation_func)
         try:
             self.update_progress(0)
             kwargs['progress_callback'] = self.update_progress
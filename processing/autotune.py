@@ -0,0 +1,380 @@
+"""
+Per-machine selection of the fastest execution strategy for each operation.
+
+The first time an operation is called for a given (operation, size, channels,
+dtype, parameters) bucket, every registered strategy is timed on a synthetic
+image with the same shape as the one being processed, and the winner is
+stored in a JSON calibration table. Later calls, including those in later
+sessions, dispatch straight to the stored choice. By default the timing runs
+on a background thread after the call returns, and the call itself uses
+DEFAULT_STRATEGY, so a first use never waits on benchmarking.
+
+Inspect, override or re-calibrate the table from the command line:
+
+    python -m processing.autotune show
+    python -m processing.autotune override "smooth_image|1024|3|uint8|k=5" fft
+    python -m processing.autotune clear "smooth_image|1024|3|uint8|k=5"
+    python -m processing.autotune recalibrate
+"""
+import argparse
+import functools
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from processing import operations
+
+TABLE_VERSION = 3
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".digital_image_toolkit", "autotune.json")
+
+STRATEGIES = {
+    "smooth_image": {
+        "loop": operations.smooth_image,
+        "vectorized": operations.smooth_image_vectorized,
+        "parallel": operations.smooth_image_parallel,
+        "fft": operations.smooth_image_fft,
+    },
+    "sharpen_image": {
+        "loop": operations.sharpen_image,
+        "vectorized": operations.sharpen_image_vectorized,
+        "parallel": operations.sharpen_image_parallel,
+    },
+    "laplacian_edge": {
+        "loop": operations.laplacian_edge,
+        "vectorized": operations.laplacian_edge_vectorized,
+        "parallel": operations.laplacian_edge_parallel,
+    },
+    "manual_rotate": {
+        "loop": operations.manual_rotate,
+        "vectorized": operations.manual_rotate_vectorized,
+        "parallel": operations.manual_rotate_parallel,
+    },
+}
+
+# The per-pixel loops stay selectable through an override, but they are orders
+# of magnitude slower than every other strategy and are not worth timing.
+REFERENCE_STRATEGY = "loop"
+
+# Used for a bucket until its calibration has finished.
+DEFAULT_STRATEGY = "vectorized"
+
+# Arguments that change which strategy wins; anything not listed here (e.g. the
+# sharpen intensity) costs the same for every value.
+BUCKET_PARAMS = {
+    "smooth_image": lambda kernel_size: f"k={kernel_size}",
+}
+
+
+def _parse_kernel_size(text):
+    if not text.startswith("k="):
+        raise ValueError(text)
+    kernel_size = int(text[2:])
+    if kernel_size < 1 or kernel_size % 2 == 0:
+        raise ValueError(text)
+    return {"kernel_size": kernel_size}
+
+
+# Inverse of BUCKET_PARAMS, used to validate hand-written keys.
+BUCKET_PARAM_PARSERS = {
+    "smooth_image": _parse_kernel_size,
+}
+
+MIN_BUCKET_SIDE = 64
+REPEATS = 3
+REPEAT_BUDGET = 0.5  # seconds; a strategy slower than this is timed only once
+
+
+class AutoTuner:
+    def __init__(self, path=DEFAULT_PATH, strategies=None, background=True):
+        self.path = path
+        self.strategies = STRATEGIES if strategies is None else strategies
+        self.background = background
+        self.table = {"version": TABLE_VERSION, "cpu_count": os.cpu_count(), "decisions": self._load()}
+        # Decisions this process has made or cleared (None) since its last save.
+        self._changes = {}
+        # _lock guards the table and the pending set; _benchmark_lock keeps
+        # background calibrations from running (and skewing each other) at once.
+        self._lock = threading.RLock()
+        self._benchmark_lock = threading.Lock()
+        self._pending = {}
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                table = json.load(f)
+        except (OSError, ValueError):
+            table = {}
+        # Anything that isn't the table layout save() writes is treated like an
+        # unreadable file rather than trusted.
+        if not isinstance(table, dict):
+            table = {}
+
+        decisions = table.get("decisions") if table.get("version") == TABLE_VERSION else {}
+        if not isinstance(decisions, dict):
+            decisions = {}
+        decisions = {key: entry for key, entry in decisions.items()
+                     if isinstance(entry, dict) and isinstance(entry.get("strategy"), str)}
+        if table.get("cpu_count") != os.cpu_count():
+            # Timings from a different core count are stale; keep only user overrides.
+            decisions = {key: entry for key, entry in decisions.items() if entry.get("override")}
+        return decisions
+
+    def _record(self, key, entry):
+        with self._lock:
+            if entry is None:
+                self.table["decisions"].pop(key, None)
+            else:
+                self.table["decisions"][key] = entry
+            self._changes[key] = entry
+
+    def save(self):
+        """
+        Merges this process's changes into the table on disk and writes it atomically.
+
+        The file is re-read first so that overrides and clears made elsewhere
+        (e.g. the CLI while the GUI is open) survive; a calibration from this
+        process never replaces an override that is already on disk.
+        """
+        with self._lock:
+            decisions = self._load()
+            for key, entry in self._changes.items():
+                if entry is None:
+                    decisions.pop(key, None)
+                elif entry.get("override") or not decisions.get(key, {}).get("override"):
+                    decisions[key] = entry
+            table = {"version": TABLE_VERSION, "cpu_count": os.cpu_count(), "decisions": decisions}
+            try:
+                text = json.dumps(table, indent=2, sort_keys=True)
+            except (TypeError, ValueError):
+                # Leave the file and the pending changes alone rather than write a partial table.
+                return
+            self.table = table
+            self._changes = {}
+
+            try:
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+                try:
+                    with os.fdopen(fd, "w") as f:
+                        f.write(text)
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
+            except OSError:
+                # The table is only a cache; the in-memory decisions keep working.
+                pass
+
+    def bind(self, name, args=(), kwargs=None):
+        """
+        Resolves an operation's positional and keyword arguments into one dict
+        keyed by parameter name, leaving out the image and progress callback.
+        Raises TypeError for arguments the operation does not accept.
+        """
+        strategies = self.strategies[name]
+        reference = strategies.get(REFERENCE_STRATEGY) or next(iter(strategies.values()))
+        signature = inspect.signature(reference)
+        image_param = next(iter(signature.parameters))
+        bound = signature.bind(None, *args, **(kwargs or {}))
+        # numpy scalars become plain Python values so the table stays JSON-serializable.
+        return {key: value.item() if isinstance(value, np.generic) else value
+                for key, value in bound.arguments.items()
+                if key not in (image_param, "progress_callback")}
+
+    def bucket(self, name, image_array, params):
+        side = max(MIN_BUCKET_SIDE, 1 << (max(image_array.shape[:2]) - 1).bit_length())
+        channels = image_array.shape[2] if image_array.ndim == 3 else 1
+        params = BUCKET_PARAMS[name](**params) if name in BUCKET_PARAMS else ""
+        return f"{name}|{side}|{channels}|{image_array.dtype}|{params}"
+
+    def _benchmark(self, name, shape, dtype, params):
+        sample = np.random.default_rng(0).integers(0, 256, size=shape).astype(dtype)
+        timings = {}
+        for strategy, func in self.strategies[name].items():
+            if strategy == REFERENCE_STRATEGY:
+                continue
+            best = float("inf")
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                func(sample, **params)
+                best = min(best, time.perf_counter() - start)
+                if best > REPEAT_BUDGET:
+                    break
+            timings[strategy] = best
+        if not timings:
+            return REFERENCE_STRATEGY, timings
+        return min(timings, key=timings.get), timings
+
+    def calibrate(self, name, key, shape, dtype, params):
+        """Times every strategy at ``shape`` and records the fastest for the bucket."""
+        # Which strategy wins shifts with size (FFT overtakes the direct sums on
+        # large images), so the timing runs at the real shape, never a scaled-down one.
+        shape = list(shape)
+        strategy, timings = self._benchmark(name, shape, dtype, params)
+        entry = {"strategy": strategy, "timings": timings, "shape": shape, "dtype": str(dtype), "params": dict(params), "override": False}
+        self._record(key, entry)
+        return entry
+
+    def _default(self, name):
+        strategies = self.strategies[name]
+        if DEFAULT_STRATEGY in strategies:
+            return DEFAULT_STRATEGY
+        return next((strategy for strategy in strategies if strategy != REFERENCE_STRATEGY), REFERENCE_STRATEGY)
+
+    def choose(self, name, image_array, args=(), kwargs=None):
+        """Returns the strategy for this call's bucket, or the default while it is uncalibrated in background mode."""
+        return self._choose(name, image_array, self.bind(name, args, kwargs))
+
+    def _choose(self, name, image_array, params):
+        key = self.bucket(name, image_array, params)
+        with self._lock:
+            entry = self.table["decisions"].get(key)
+        if entry is None and not self.background:
+            entry = self.calibrate(name, key, image_array.shape, image_array.dtype, params)
+            self.save()
+        return entry["strategy"] if entry else self._default(name)
+
+    def _calibrate_later(self, name, image_array, params):
+        key = self.bucket(name, image_array, params)
+        with self._lock:
+            if key in self.table["decisions"] or key in self._pending:
+                return
+            thread = threading.Thread(target=self._calibrate_in_background,
+                                      args=(name, key, image_array.shape, image_array.dtype, params), daemon=True)
+            self._pending[key] = thread
+        thread.start()
+
+    def _calibrate_in_background(self, name, key, shape, dtype, params):
+        try:
+            with self._benchmark_lock:
+                self.calibrate(name, key, shape, dtype, params)
+            self.save()
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def wait(self, timeout=None):
+        """Blocks until every background calibration started so far has finished."""
+        with self._lock:
+            threads = list(self._pending.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def dispatch(self, name, image_array, *args, **kwargs):
+        params = self.bind(name, args, kwargs)
+        strategy = self._choose(name, image_array, params)
+        result = self.strategies[name][strategy](image_array, *args, **kwargs)
+        if self.background:
+            # Started only once the real work is done so the two don't compete for cores.
+            self._calibrate_later(name, image_array, params)
+        return result
+
+    def resolve(self, func):
+        """Returns a tuned stand-in for ``func``, or ``func`` itself if it has no alternatives."""
+        name = func.__name__
+        if name not in self.strategies:
+            return func
+
+        @functools.wraps(func)
+        def tuned(image_array, *args, **kwargs):
+            return self.dispatch(name, image_array, *args, **kwargs)
+        return tuned
+
+    def decisions(self):
+        with self._lock:
+            return dict(self.table["decisions"])
+
+    def _validate_key(self, key):
+        """Checks that ``key`` has the ``name|side|channels|dtype|params`` shape bucket() produces."""
+        parts = key.split("|")
+        if len(parts) != 5:
+            raise ValueError(f"Malformed bucket key '{key}'; expected name|side|channels|dtype|params.")
+        name, side, channels, dtype, params = parts
+        if name not in self.strategies:
+            raise ValueError(f"Unknown operation '{name}'.")
+        if not side.isdigit() or int(side) < MIN_BUCKET_SIDE or int(side) & (int(side) - 1):
+            raise ValueError(f"Bucket side '{side}' must be a power of two of at least {MIN_BUCKET_SIDE}.")
+        if not channels.isdigit() or int(channels) < 1:
+            raise ValueError(f"Bucket channel count '{channels}' must be a positive integer.")
+        try:
+            np.dtype(dtype)
+        except TypeError:
+            raise ValueError(f"Unknown dtype '{dtype}' in bucket key.")
+        if name in BUCKET_PARAMS:
+            try:
+                valid = BUCKET_PARAMS[name](**BUCKET_PARAM_PARSERS[name](params)) == params
+            except ValueError:
+                valid = False
+            if not valid:
+                raise ValueError(f"Bucket key for {name} has parameters '{params}'; expected the form 'k=5' (odd kernel size).")
+        elif params:
+            raise ValueError(f"Bucket key for {name} needs an empty parameter field.")
+        return name
+
+    def override(self, key, strategy):
+        name = self._validate_key(key)
+        if strategy not in self.strategies[name]:
+            raise ValueError(f"Unknown strategy '{strategy}' for {name}; choose from {', '.join(self.strategies[name])}.")
+        with self._lock:
+            entry = dict(self.table["decisions"].get(key, {"timings": {}}))
+            entry["strategy"] = strategy
+            entry["override"] = True
+            self._record(key, entry)
+        self.save()
+
+    def clear(self, key):
+        """Forgets a bucket so that its next use calibrates it again."""
+        self._record(key, None)
+        self.save()
+
+    def recalibrate(self, include_overrides=False):
+        for key, entry in self.decisions().items():
+            if entry.get("override") and not include_overrides:
+                continue
+            if "shape" not in entry:
+                # An override set before the bucket was ever used; nothing to replay.
+                continue
+            self.calibrate(key.split("|")[0], key, entry["shape"], np.dtype(entry["dtype"]), entry["params"])
+        self.save()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m processing.autotune", description="Inspect or re-calibrate the backend auto-tuner.")
+    parser.add_argument("--path", default=DEFAULT_PATH, help="calibration table location")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    commands.add_parser("show", help="list every bucket and its chosen strategy")
+    recalibrate = commands.add_parser("recalibrate", help="re-time every known bucket")
+    recalibrate.add_argument("--include-overrides", action="store_true", help="also replace manual overrides")
+    override = commands.add_parser("override", help="pin a bucket to a strategy")
+    override.add_argument("key")
+    override.add_argument("strategy")
+    clear = commands.add_parser("clear", help="forget a bucket so it is calibrated on next use")
+    clear.add_argument("key")
+    args = parser.parse_args(argv)
+
+    tuner = AutoTuner(args.path, background=False)
+    if args.command == "recalibrate":
+        tuner.recalibrate(include_overrides=args.include_overrides)
+    elif args.command == "override":
+        try:
+            tuner.override(args.key, args.strategy)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.command == "clear":
+        tuner.clear(args.key)
+
+    for key, entry in sorted(tuner.decisions().items()):
+        timings = ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in sorted(entry.get("timings", {}).items()))
+        suffix = " (override)" if entry.get("override") else ""
+        print(f"{key}: {entry['strategy']}{suffix}" + (f"  [{timings}]" if timings else ""))
+
+
+if __name__ == "__main__":
+    main()
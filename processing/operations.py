@@ -1,5 +1,7 @@
 import numpy as np
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import matplotlib.pyplot as plt
 import io
 from PIL import Image
@@ -99,6 +101,9 @@ def laplacian_edge(arr: np.ndarray, progress_callback=None) -> np.ndarray:
         if progress_callback:
             progress_callback(i / (height - 2*pad) * 100)
             
+    return _scale_edges(out)
+
+def _scale_edges(out):
     out = np.abs(out)
     out = (out / np.max(out) * 255) if np.max(out) > 0 else out
     return np.clip(out, 0, 255).astype(np.uint8)
@@ -164,4 +169,154 @@ def manual_rotate(image_array, angle_deg, progress_callback=None):
         if progress_callback:
             progress_callback((y_new + 1) / new_h * 100)
 
-    return rotated_array
\ No newline at end of file
+    return rotated_array
+
+# --- Fast execution strategies ---
+# Each operation above is a per-pixel reference loop. The variants below produce
+# the same result using whole-array numpy work ("vectorized"), the same work split
+# into row strips on a thread pool ("parallel"), or an FFT convolution ("fft").
+# processing.autotune picks between them per image size.
+
+def _correlate_rows(padded, kernel, out, row_start, row_stop):
+    width = out.shape[1]
+    acc = out[row_start:row_stop]
+    acc[...] = 0
+    for di in range(kernel.shape[0]):
+        for dj in range(kernel.shape[1]):
+            if kernel[di, dj]:
+                acc += kernel[di, dj] * padded[row_start + di:row_stop + di, dj:dj + width]
+
+# Rows handed to fill_rows at a time, so the temporaries a strip allocates
+# stay bounded however large the image is.
+STRIP_ROWS = 256
+
+def _run_row_strips(fill_rows, height, progress_callback=None, workers=None):
+    workers = max(1, min(workers or os.cpu_count() or 1, height))
+    strip_rows = max(1, min(STRIP_ROWS, -(-height // workers)))
+    bounds = list(range(0, height, strip_rows)) + [height]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fill_rows, start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+        for done, future in enumerate(as_completed(futures), 1):
+            future.result()
+            if progress_callback:
+                progress_callback(done / len(futures) * 100)
+
+def _fill(fill_rows, height, parallel, progress_callback):
+    if parallel:
+        _run_row_strips(fill_rows, height, progress_callback)
+    else:
+        for start in range(0, height, STRIP_ROWS):
+            stop = min(start + STRIP_ROWS, height)
+            fill_rows(start, stop)
+            if progress_callback:
+                progress_callback(stop / height * 100)
+
+def _smooth_fast(image_array, kernel_size, parallel, progress_callback):
+    mean_filter = np.ones((kernel_size, kernel_size)) / (kernel_size * kernel_size)
+    smoothed_array = np.zeros_like(image_array, dtype=np.float64)
+    padding = kernel_size // 2
+    is_color = image_array.ndim == 3
+    padded_array = np.pad(image_array, ((padding, padding), (padding, padding), (0, 0)) if is_color else padding, 'constant')
+
+    def fill_rows(start, stop):
+        _correlate_rows(padded_array, mean_filter, smoothed_array, start, stop)
+
+    _fill(fill_rows, image_array.shape[0], parallel, progress_callback)
+    return np.clip(smoothed_array, 0, 255).astype(np.uint8)
+
+def smooth_image_vectorized(image_array, kernel_size, progress_callback=None):
+    return _smooth_fast(image_array, kernel_size, False, progress_callback)
+
+def smooth_image_parallel(image_array, kernel_size, progress_callback=None):
+    return _smooth_fast(image_array, kernel_size, True, progress_callback)
+
+def smooth_image_fft(image_array, kernel_size, progress_callback=None):
+    padding = kernel_size // 2
+    height, width = image_array.shape[:2]
+    is_color = image_array.ndim == 3
+    padded_array = np.pad(image_array.astype(np.float64), ((padding, padding), (padding, padding), (0, 0)) if is_color else padding, 'constant')
+    fft_shape = padded_array.shape[:2]
+
+    # The box kernel is symmetric, so convolution equals the correlation the loop
+    # computes; the window ending at (i + k - 1) starts at i and never wraps.
+    mean_filter = np.zeros(fft_shape)
+    mean_filter[:kernel_size, :kernel_size] = 1.0 / (kernel_size * kernel_size)
+    kernel_fft = np.fft.rfft2(mean_filter)
+    if is_color:
+        kernel_fft = kernel_fft[..., np.newaxis]
+    smoothed_array = np.fft.irfft2(np.fft.rfft2(padded_array, axes=(0, 1)) * kernel_fft, s=fft_shape, axes=(0, 1))
+    smoothed_array = smoothed_array[kernel_size - 1:kernel_size - 1 + height, kernel_size - 1:kernel_size - 1 + width]
+    return np.clip(smoothed_array, 0, 255).astype(np.uint8)
+
+def _sharpen_fast(image_array, intensity, parallel, progress_callback):
+    kernel = np.array([[-1, -1, -1], [-1,  9, -1], [-1, -1, -1]])
+    source_array = image_array.astype(np.float32)
+    sharpened_array = np.zeros_like(source_array, dtype=np.float64)
+    height, width = source_array.shape[:2]
+    if height < 3 or width < 3:
+        return sharpened_array.astype(np.uint8)
+
+    # Like the loop, only interior pixels are sharpened; the border stays black.
+    inner = sharpened_array[1:-1, 1:-1]
+
+    def fill_rows(start, stop):
+        _correlate_rows(source_array, kernel, inner, start, stop)
+        inner[start:stop] = inner[start:stop] * intensity + (1 - intensity) * source_array[1 + start:1 + stop, 1:-1]
+
+    _fill(fill_rows, height - 2, parallel, progress_callback)
+    return np.clip(sharpened_array, 0, 255).astype(np.uint8)
+
+def sharpen_image_vectorized(image_array, intensity, progress_callback=None):
+    return _sharpen_fast(image_array, intensity, False, progress_callback)
+
+def sharpen_image_parallel(image_array, intensity, progress_callback=None):
+    return _sharpen_fast(image_array, intensity, True, progress_callback)
+
+def _laplacian_fast(arr, parallel, progress_callback):
+    gray = convert_to_grayscale(arr) if arr.ndim == 3 else arr.squeeze()
+    kernel = np.array([[1, 1, 1],
+                       [1,-8, 1],
+                       [1, 1, 1]], dtype=np.float32)
+    padded = np.pad(gray, 1, mode="constant", constant_values=0)
+    out = np.zeros_like(gray, dtype=np.float32)
+
+    def fill_rows(start, stop):
+        _correlate_rows(padded, kernel, out, start, stop)
+
+    _fill(fill_rows, gray.shape[0], parallel, progress_callback)
+    return _scale_edges(out)
+
+def laplacian_edge_vectorized(arr: np.ndarray, progress_callback=None) -> np.ndarray:
+    return _laplacian_fast(arr, False, progress_callback)
+
+def laplacian_edge_parallel(arr: np.ndarray, progress_callback=None) -> np.ndarray:
+    return _laplacian_fast(arr, True, progress_callback)
+
+def _rotate_fast(image_array, angle_deg, parallel, progress_callback):
+    angle_rad = np.deg2rad(angle_deg)
+    h, w = image_array.shape[:2]
+    cos_a, sin_a = np.abs(np.cos(angle_rad)), np.abs(np.sin(angle_rad))
+    new_w, new_h = int(h * sin_a + w * cos_a), int(h * cos_a + w * sin_a)
+    center_orig_x, center_orig_y = w // 2, h // 2
+    center_new_x, center_new_y = new_w // 2, new_h // 2
+    is_color = image_array.ndim == 3
+    rotated_array = np.zeros((new_h, new_w, image_array.shape[2]) if is_color else (new_h, new_w), dtype=np.uint8)
+    cos_r, sin_r = np.cos(angle_rad), np.sin(angle_rad)
+
+    def fill_rows(start, stop):
+        y_new, x_new = np.mgrid[start:stop, 0:new_w]
+        x_c, y_c = x_new - center_new_x, y_new - center_new_y
+        # np.rint rounds half to even, matching round() in the reference loop.
+        x = np.rint(x_c * cos_r + y_c * sin_r + center_orig_x).astype(np.intp)
+        y = np.rint(-x_c * sin_r + y_c * cos_r + center_orig_y).astype(np.intp)
+        valid = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+        rotated_array[start:stop][valid] = image_array[y[valid], x[valid]]
+
+    _fill(fill_rows, new_h, parallel, progress_callback)
+    return rotated_array
+
+def manual_rotate_vectorized(image_array, angle_deg, progress_callback=None):
+    return _rotate_fast(image_array, angle_deg, False, progress_callback)
+
+def manual_rotate_parallel(image_array, angle_deg, progress_callback=None):
+    return _rotate_fast(image_array, angle_deg, True, progress_callback)
@@ -0,0 +1,152 @@
+import unittest
+import numpy as np
+import sys
+import os
+import json
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processing import autotune, operations
+
+class TestAutoTuner(unittest.TestCase):
+    """Test suite for the backend auto-tuner."""
+
+    def setUp(self):
+        """Point every tuner at a throwaway calibration table."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "autotune.json")
+        self.image = np.zeros((20, 30, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_foreground_calibration(self):
+        """Test that with background calibration off, the first call is timed before it runs."""
+        tuner = autotune.AutoTuner(self.path, background=False)
+        tuner.dispatch("sharpen_image", self.image, 1.0)
+        self.assertIn("sharpen_image|64|3|uint8|", tuner.decisions())
+
+    def test_bucket_key(self):
+        """Test that sizes round up to a power of two and only relevant parameters are kept."""
+        tuner = autotune.AutoTuner(self.path)
+        self.assertEqual(tuner.bucket("smooth_image", self.image, {"kernel_size": 5}), "smooth_image|64|3|uint8|k=5")
+        big_gray = np.zeros((300, 700), dtype=np.uint8)
+        self.assertEqual(tuner.bucket("sharpen_image", big_gray, {"intensity": 1.5}), "sharpen_image|1024|1|uint8|")
+
+    def test_keyword_arguments(self):
+        """Test that keyword and positional operation arguments land in the same bucket."""
+        tuner = autotune.AutoTuner(self.path, background=False)
+        result = tuner.dispatch("smooth_image", self.image, kernel_size=3, progress_callback=None)
+        np.testing.assert_allclose(result, operations.smooth_image(self.image, 3), atol=1)
+        self.assertEqual(list(tuner.decisions()), ["smooth_image|64|3|uint8|k=3"])
+        self.assertEqual(tuner.decisions()["smooth_image|64|3|uint8|k=3"]["params"], {"kernel_size": 3})
+        tuner.recalibrate()
+        entry = tuner.decisions()["smooth_image|64|3|uint8|k=3"]
+        self.assertEqual(entry["params"], {"kernel_size": 3})
+        self.assertNotEqual(entry["strategy"], "loop")
+
+        with self.assertRaises(TypeError):
+            tuner.dispatch("smooth_image", self.image, size=3)
+
+    def test_first_use_calibrates_and_persists(self):
+        """Test that a new bucket is benchmarked in the background and the decision is reused from disk."""
+        tuner = autotune.AutoTuner(self.path)
+        key = "smooth_image|64|3|uint8|k=3"
+        self.assertEqual(tuner.choose("smooth_image", self.image, (3,)), autotune.DEFAULT_STRATEGY)
+        result = tuner.dispatch("smooth_image", self.image, 3)
+        np.testing.assert_allclose(result, operations.smooth_image(self.image, 3), atol=1)
+        tuner.wait()
+
+        entry = tuner.decisions()[key]
+        self.assertIn(entry["strategy"], ("vectorized", "parallel", "fft"))
+        self.assertNotIn("loop", entry["timings"])
+        self.assertEqual(entry["shape"], [20, 30, 3])
+
+        reloaded = autotune.AutoTuner(self.path)
+        self.assertEqual(reloaded.decisions()[key]["strategy"], entry["strategy"])
+
+    def test_override_and_clear(self):
+        """Test that an override pins a bucket and survives recalibration."""
+        tuner = autotune.AutoTuner(self.path)
+        key = "manual_rotate|64|3|uint8|"
+        tuner.override(key, "loop")
+        self.assertEqual(tuner.choose("manual_rotate", self.image, (30,)), "loop")
+
+        tuner.recalibrate()
+        self.assertEqual(tuner.decisions()[key]["strategy"], "loop")
+
+        with self.assertRaises(ValueError):
+            tuner.override(key, "gpu")
+        for bad_key in ("smooth_image", "smooth_image|100|3|uint8|k=5", "smooth_image|32|3|uint8|k=5",
+                        "smooth_image|64|3|pixels|k=5", "smooth_image|64|3|uint8|", "manual_rotate|64|3|uint8|a=30",
+                        "smooth_image|64|3|uint8|kernel=5", "smooth_image|64|3|uint8|k=4", "smooth_image|64|3|uint8|k=05"):
+            with self.assertRaises(ValueError):
+                tuner.override(bad_key, "vectorized")
+        self.assertEqual(list(tuner.decisions()), [key])
+
+        tuner.clear(key)
+        self.assertNotIn(key, autotune.AutoTuner(self.path).decisions())
+
+    def test_table_from_other_machine_is_discarded(self):
+        """Test that timings recorded with a different core count are dropped, overrides kept."""
+        with open(self.path, "w") as f:
+            json.dump({"version": autotune.TABLE_VERSION, "cpu_count": -1, "decisions": {
+                "smooth_image|64|3|uint8|k=3": {"strategy": "fft", "override": False},
+                "smooth_image|64|3|uint8|k=5": {"strategy": "loop", "override": True},
+            }}, f)
+        tuner = autotune.AutoTuner(self.path)
+        self.assertEqual(list(tuner.decisions()), ["smooth_image|64|3|uint8|k=5"])
+
+    def test_numpy_arguments_are_saved(self):
+        """Test that numpy scalar arguments are stored as plain values and the table stays loadable."""
+        tuner = autotune.AutoTuner(self.path, background=False)
+        tuner.override("smooth_image|64|3|uint8|k=5", "fft")
+        tuner.dispatch("smooth_image", self.image, np.int64(3))
+        self.assertEqual(tuner.decisions()["smooth_image|64|3|uint8|k=3"]["params"], {"kernel_size": 3})
+        reloaded = autotune.AutoTuner(self.path).decisions()
+        self.assertEqual(reloaded["smooth_image|64|3|uint8|k=5"]["strategy"], "fft")
+        self.assertIn("smooth_image|64|3|uint8|k=3", reloaded)
+
+    def test_save_keeps_changes_made_elsewhere(self):
+        """Test that a long-lived tuner's save does not undo another process's overrides and clears."""
+        gui = autotune.AutoTuner(self.path, background=False)
+        gui.dispatch("smooth_image", self.image, 3)
+        gui.dispatch("smooth_image", self.image, 5)
+
+        cli = autotune.AutoTuner(self.path, background=False)
+        cli.override("smooth_image|64|3|uint8|k=3", "loop")
+        cli.clear("smooth_image|64|3|uint8|k=5")
+
+        gui.dispatch("sharpen_image", self.image, 1.0)
+        decisions = autotune.AutoTuner(self.path).decisions()
+        self.assertEqual(decisions["smooth_image|64|3|uint8|k=3"]["strategy"], "loop")
+        self.assertNotIn("smooth_image|64|3|uint8|k=5", decisions)
+        self.assertIn("sharpen_image|64|3|uint8|", decisions)
+        self.assertEqual(gui.choose("smooth_image", self.image, (3,)), "loop")
+
+    def test_corrupt_table_is_ignored(self):
+        """Test that a table of the wrong shape loads as empty, keeping only well-formed entries."""
+        for content in ([], "text", {"version": autotune.TABLE_VERSION, "decisions": []}):
+            with open(self.path, "w") as f:
+                json.dump(content, f)
+            self.assertEqual(autotune.AutoTuner(self.path).decisions(), {})
+
+        with open(self.path, "w") as f:
+            json.dump({"version": autotune.TABLE_VERSION, "cpu_count": os.cpu_count(), "decisions": {
+                "smooth_image|64|3|uint8|k=3": {"strategy": "fft"},
+                "smooth_image|64|3|uint8|k=5": ["fft"],
+                "smooth_image|64|3|uint8|k=7": {"timings": {}},
+            }}, f)
+        self.assertEqual(list(autotune.AutoTuner(self.path).decisions()), ["smooth_image|64|3|uint8|k=3"])
+
+    def test_resolve(self):
+        """Test that only operations with alternative strategies are wrapped."""
+        tuner = autotune.AutoTuner(self.path)
+        self.assertIs(tuner.resolve(operations.negative_image), operations.negative_image)
+        tuned = tuner.resolve(operations.laplacian_edge)
+        self.assertEqual(tuned.__name__, "laplacian_edge")
+        np.testing.assert_array_equal(tuned(self.image), operations.laplacian_edge(self.image))
+
+if __name__ == '__main__':
+    unittest.main()
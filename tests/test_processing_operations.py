@@ -87,5 +87,45 @@ class TestImageProcessing(unittest.TestCase):
         result_dec = operations.adjust_contrast(self.gray_image, alpha_decrease)
         self.assertEqual(result_dec[0, 0], 89)
 
+    def test_fast_strategies_match_reference(self):
+        """Test that the vectorized, parallel and FFT paths reproduce the per-pixel loops."""
+        rng = np.random.default_rng(0)
+        images = [rng.integers(0, 256, (17, 13), dtype=np.uint8),
+                  rng.integers(0, 256, (11, 14, 3), dtype=np.uint8)]
+        for image in images:
+            expected = operations.smooth_image(image, 5)
+            for fast in (operations.smooth_image_vectorized, operations.smooth_image_parallel, operations.smooth_image_fft):
+                # Summation order differs, so truncation may land one level apart.
+                np.testing.assert_allclose(fast(image, 5), expected, atol=1)
+
+            expected = operations.sharpen_image(image, 0.7)
+            for fast in (operations.sharpen_image_vectorized, operations.sharpen_image_parallel):
+                np.testing.assert_allclose(fast(image, 0.7), expected, atol=1)
+
+            expected = operations.laplacian_edge(image)
+            for fast in (operations.laplacian_edge_vectorized, operations.laplacian_edge_parallel):
+                np.testing.assert_array_equal(fast(image), expected)
+
+            expected = operations.manual_rotate(image, 30)
+            for fast in (operations.manual_rotate_vectorized, operations.manual_rotate_parallel):
+                np.testing.assert_array_equal(fast(image, 30), expected)
+
+    def test_fast_strategies_across_row_strips(self):
+        """Test that images taller than one row strip are stitched back together exactly."""
+        image = np.random.default_rng(1).integers(0, 256, (operations.STRIP_ROWS + 9, 6), dtype=np.uint8)
+        np.testing.assert_array_equal(operations.laplacian_edge_vectorized(image), operations.laplacian_edge(image))
+        np.testing.assert_allclose(operations.smooth_image_vectorized(image, 3), operations.smooth_image(image, 3), atol=1)
+        np.testing.assert_array_equal(operations.manual_rotate_vectorized(image, 10), operations.manual_rotate(image, 10))
+
+    def test_fast_strategies_report_progress(self):
+        """Test that vectorized and parallel paths report progress once per row strip, ending at 100."""
+        image = np.zeros((2 * operations.STRIP_ROWS + 1, 4), dtype=np.uint8)
+        for fast in (operations.smooth_image_vectorized, operations.smooth_image_parallel):
+            reported = []
+            fast(image, 3, progress_callback=reported.append)
+            self.assertGreaterEqual(len(reported), 3 if fast is operations.smooth_image_vectorized else 1)
+            self.assertEqual(reported, sorted(reported))
+            self.assertAlmostEqual(reported[-1], 100)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+import sys
+import os
+import tempfile
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import export
+
+class TestExport(unittest.TestCase):
+    """Test suite for the image export presets."""
+
+    def setUp(self):
+        """Create a gradient image taller than one strip and a scratch directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        ramp = np.add.outer(np.arange(export.STRIP_ROWS + 37), np.arange(41)) % 256
+        self.color_image = (np.dstack([ramp, ramp[::-1], ramp[:, ::-1]]) + rng.integers(0, 4, ramp.shape + (3,))).astype(np.uint8)
+        self.gray_image = self.color_image[..., 0].copy()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_png_presets_are_lossless(self):
+        """Test that the strip-streamed PNG writer round-trips exactly for every channel layout."""
+        with_alpha = np.dstack([self.color_image, self.gray_image])
+        images = [self.gray_image, self.gray_image[:, :, np.newaxis].repeat(2, axis=2), self.color_image, with_alpha]
+        for preset in ("png_fast", "png_small"):
+            for image in images:
+                result = export.export_image(image, self._path("out.png"), preset)
+                decoded = np.array(Image.open(result.path))
+                np.testing.assert_array_equal(decoded.reshape(image.shape), image)
+
+    def test_png_option_overrides(self):
+        """Test that PNG presets take compress_level/row_filter overrides and reject anything else."""
+        result = export.export_image(self.color_image, self._path("out.png"), "png_fast", compress_level=0, row_filter="adaptive")
+        np.testing.assert_array_equal(np.array(Image.open(result.path)), self.color_image)
+
+        for bad in ({"optimize": True}, {"compress_level": 12}, {"row_filter": "paeth"}):
+            with self.assertRaises(ValueError):
+                export.export_image(self.color_image, self._path("bad.png"), "png_fast", **bad)
+        self.assertFalse(os.path.exists(self._path("bad.png")))
+
+    def test_matches_extension(self):
+        """Test that file names are matched against each preset's format, case-insensitively."""
+        self.assertTrue(export.matches_extension("photo.PNG", "png_fast"))
+        self.assertTrue(export.matches_extension("photo.jpeg", "jpeg_progressive"))
+        self.assertTrue(export.matches_extension("photo.tiff", "tiff"))
+        self.assertFalse(export.matches_extension("photo.jpg", "png_fast"))
+        self.assertFalse(export.matches_extension("photo", "jpeg"))
+
+    def test_result_records_size_and_time(self):
+        """Test that each export reports its encode time and the bytes written."""
+        result = export.export_image(self.color_image, self._path("out.tif"), "tiff")
+        self.assertEqual(result.preset, "tiff")
+        self.assertEqual(result.size_bytes, os.path.getsize(result.path))
+        self.assertGreaterEqual(result.seconds, 0)
+        self.assertFalse(os.path.exists(result.path + ".part"))
+
+    def test_export_many(self):
+        """Test that one result can be written to every preset in a single call."""
+        targets = [(self._path(name + preset["extension"]), name) for name, preset in export.PRESETS.items()]
+        results = export.export_many(self.color_image, targets)
+        self.assertEqual([result.preset for result in results], list(export.PRESETS))
+
+        jpeg = Image.open(self._path("jpeg_progressive.jpg"))
+        self.assertTrue(jpeg.info.get("progressive"))
+        np.testing.assert_array_equal(np.array(Image.open(self._path("tiff.tif"))), self.color_image)
+        self.assertLess(os.path.getsize(self._path("png_small.png")), os.path.getsize(self._path("png_fast.png")))
+
+        with self.assertRaises(ValueError):
+            export.export_many(self.color_image, [(self._path("first.png"), "png_fast"), (self._path("x.bmp"), "bmp")])
+        self.assertFalse(os.path.exists(self._path("first.png")))
+
+    def test_worker_runs_in_background(self):
+        """Test that the worker returns a future that resolves to the export results."""
+        worker = export.ExportWorker()
+        try:
+            future = worker.submit(self.gray_image, [(self._path("out.jpg"), "jpeg")])
+            result, = future.result(timeout=30)
+        finally:
+            worker.shutdown()
+        self.assertTrue(os.path.exists(result.path))
+
+if __name__ == '__main__':
+    unittest.main()
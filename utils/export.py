@@ -0,0 +1,218 @@
+"""
+Image export with encoder presets, run off the Tk thread.
+
+PNG presets are encoded straight from the numpy array a strip of rows at a
+time, so a large result is compressed and written incrementally instead of
+being handed to the encoder as one block. JPEG and TIFF go through Pillow.
+Every export is written to a ``.part`` file next to the target and moved into
+place once complete, and reports how long it took and how large it is.
+"""
+import os
+import struct
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+PRESETS = {
+    "png_fast": {
+        "label": "PNG - fast (low compression)",
+        "format": "PNG",
+        "extension": ".png",
+        "extensions": (".png",),
+        "options": {"compress_level": 1, "row_filter": "up"},
+    },
+    "png_small": {
+        "label": "PNG - small (best compression)",
+        "format": "PNG",
+        "extension": ".png",
+        "extensions": (".png",),
+        "options": {"compress_level": 9, "row_filter": "adaptive"},
+    },
+    "jpeg": {
+        "label": "JPEG - quality 90",
+        "format": "JPEG",
+        "extension": ".jpg",
+        "extensions": (".jpg", ".jpeg"),
+        "options": {"quality": 90, "optimize": True},
+    },
+    "jpeg_progressive": {
+        "label": "JPEG - progressive, quality 85",
+        "format": "JPEG",
+        "extension": ".jpg",
+        "extensions": (".jpg", ".jpeg"),
+        "options": {"quality": 85, "optimize": True, "progressive": True},
+    },
+    "tiff": {
+        "label": "TIFF - uncompressed",
+        "format": "TIFF",
+        "extension": ".tif",
+        "extensions": (".tif", ".tiff"),
+        "options": {"compression": "raw"},
+    },
+}
+
+STRIP_ROWS = 256
+
+ExportResult = namedtuple("ExportResult", ["path", "preset", "seconds", "size_bytes"])
+
+_PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+# The only encoder options PNG presets accept, whichever writer ends up used.
+PNG_OPTIONS = ("compress_level", "row_filter")
+PNG_ROW_FILTERS = ("up", "adaptive")
+
+
+def matches_extension(path, preset):
+    """Tells whether ``path`` ends in one of the file extensions of ``preset``'s format."""
+    return os.path.splitext(path)[1].lower() in PRESETS[preset]["extensions"]
+
+
+def _write_png_chunk(f, chunk_type, data):
+    f.write(struct.pack(">I", len(data)))
+    f.write(chunk_type)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFFFFFFF))
+
+
+def _filter_rows(rows, previous, bpp, row_filter):
+    """Applies PNG row filters to a strip; every filter reads only unfiltered bytes, so whole strips vectorize."""
+    rows = rows.astype(np.int16)
+    up = np.vstack([previous.astype(np.int16)[np.newaxis], rows[:-1]])
+    left = np.zeros_like(rows)
+    left[:, bpp:] = rows[:, :-bpp]
+    up_left = np.zeros_like(rows)
+    up_left[:, bpp:] = up[:, :-bpp]
+
+    if row_filter == "up":
+        return np.full(len(rows), 2, dtype=np.uint8), (rows - up).astype(np.uint8)
+
+    p = left + up - up_left
+    pa, pb, pc = np.abs(p - left), np.abs(p - up), np.abs(p - up_left)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+    candidates = np.stack([
+        rows,
+        rows - left,
+        rows - up,
+        rows - (left + up) // 2,
+        rows - paeth,
+    ]).astype(np.uint8)
+
+    # libpng's heuristic: pick the filter whose output, read as signed bytes,
+    # has the smallest absolute sum.
+    cost = np.abs(candidates.view(np.int8).astype(np.int32)).sum(axis=2)
+    filter_types = cost.argmin(axis=0).astype(np.uint8)
+    return filter_types, candidates[filter_types, np.arange(len(rows))]
+
+
+def _write_png_strips(image_array, f, compress_level=6, row_filter="adaptive", strip_rows=STRIP_ROWS):
+    height, width = image_array.shape[:2]
+    channels = image_array.shape[2] if image_array.ndim == 3 else 1
+    row_bytes = width * channels
+
+    f.write(b"\x89PNG\r\n\x1a\n")
+    _write_png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, _PNG_COLOR_TYPES[channels], 0, 0, 0))
+
+    compressor = zlib.compressobj(compress_level)
+    previous = np.zeros(row_bytes, dtype=np.uint8)
+    for start in range(0, height, strip_rows):
+        rows = np.ascontiguousarray(image_array[start:start + strip_rows]).reshape(-1, row_bytes)
+        filter_types, filtered = _filter_rows(rows, previous, channels, row_filter)
+        previous = rows[-1]
+        scanlines = np.empty((len(rows), row_bytes + 1), dtype=np.uint8)
+        scanlines[:, 0] = filter_types
+        scanlines[:, 1:] = filtered
+        data = compressor.compress(scanlines.tobytes())
+        if data:
+            _write_png_chunk(f, b"IDAT", data)
+    _write_png_chunk(f, b"IDAT", compressor.flush())
+    _write_png_chunk(f, b"IEND", b"")
+
+
+def _check_png_options(options):
+    unknown = sorted(set(options) - set(PNG_OPTIONS))
+    if unknown:
+        raise ValueError(f"Unsupported PNG option(s) {', '.join(unknown)}; PNG accepts {', '.join(PNG_OPTIONS)}.")
+    level = options["compress_level"]
+    if not isinstance(level, int) or not 0 <= level <= 9:
+        raise ValueError(f"PNG compress_level must be an integer from 0 to 9, not {level!r}.")
+    if options["row_filter"] not in PNG_ROW_FILTERS:
+        raise ValueError(f"PNG row_filter must be one of {', '.join(PNG_ROW_FILTERS)}, not {options['row_filter']!r}.")
+
+
+def _can_stream_png(image_array):
+    channels = image_array.shape[2] if image_array.ndim == 3 else 1
+    return image_array.dtype == np.uint8 and image_array.ndim in (2, 3) and channels in _PNG_COLOR_TYPES
+
+
+def _encode(image_array, get_image, path, preset, options):
+    spec = PRESETS[preset]
+    tmp_path = path + ".part"
+    start = time.perf_counter()
+    try:
+        with open(tmp_path, "wb") as f:
+            if spec["format"] == "PNG" and _can_stream_png(image_array):
+                _write_png_strips(image_array, f, **options)
+            elif spec["format"] == "PNG":
+                # Arrays the strip writer can't take (e.g. non-uint8) go through Pillow,
+                # which picks its own row filters, so only compress_level applies here.
+                get_image().save(f, format="PNG", compress_level=options["compress_level"])
+            else:
+                get_image().save(f, format=spec["format"], **options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return ExportResult(path, preset, time.perf_counter() - start, os.path.getsize(path))
+
+
+def export_many(image_array, targets):
+    """
+    Writes one result to several ``(path, preset)`` targets.
+
+    The array is turned into a Pillow image at most once and shared by every
+    target that needs one, so nothing is re-read or re-decoded between formats.
+    Every target is validated before anything is written. Returns one
+    ExportResult per target, in order.
+    """
+    image = []
+
+    def get_image():
+        if not image:
+            image.append(Image.fromarray(image_array))
+        return image[0]
+
+    # Check every target up front so a bad one can't leave the others half written.
+    jobs = []
+    for path, preset, *overrides in targets:
+        if preset not in PRESETS:
+            raise ValueError(f"Unknown export preset '{preset}'.")
+        options = dict(PRESETS[preset]["options"], **(overrides[0] if overrides else {}))
+        if PRESETS[preset]["format"] == "PNG":
+            _check_png_options(options)
+        jobs.append((path, preset, options))
+
+    return [_encode(image_array, get_image, path, preset, options) for path, preset, options in jobs]
+
+
+def export_image(image_array, path, preset="png_fast", **options):
+    """Writes ``image_array`` to ``path`` with a preset; keyword arguments override its encoder options."""
+    return export_many(image_array, [(path, preset, options)])[0]
+
+
+class ExportWorker:
+    """Runs exports one at a time on a background thread."""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, image_array, targets):
+        """Queues an export_many call and returns its Future."""
+        return self._executor.submit(export_many, image_array, list(targets))
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)